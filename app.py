@@ -1,16 +1,26 @@
 import streamlit as st
 import pandas as pd
-import yfinance as yf
 import requests
+from requests.adapters import HTTPAdapter, Retry
 import numpy as np
+import orjson
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
+import io
+import logging
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+logger = logging.getLogger(__name__)
+
+pio.json.config.default_engine = 'orjson'
 
 # --- Configuração "Agro Profissional" ---
 st.set_page_config(page_title="AgroData Nexus | Data Eng.", page_icon="🚜", layout="wide")
 
-st.markdown("""
+CSS_AGRO = """
 <style>
     .stApp { background-color: #f4f6f0; color: #2c3e50; }
     h1, h2, h3 { color: #2e7d32 !important; font-family: 'Helvetica Neue', sans-serif; }
@@ -22,106 +32,236 @@ st.markdown("""
     }
     .stButton>button { background-color: #2e7d32; color: white; border-radius: 4px; border: none; }
 </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(CSS_AGRO, unsafe_allow_html=True)
 
 # --- FUNÇÕES DE SIMULAÇÃO (FALLBACK) ---
 
-def gerar_serie_fake(valor_inicial, volatilidade, n_dias):
-    retornos = np.random.normal(0, volatilidade, n_dias)
-    preco = valor_inicial + np.cumsum(retornos)
-    return preco
+# Semente própria por simulador (rodam em threads paralelas)
+SEMENTE_MERCADO, SEMENTE_CLIMA = np.random.SeedSequence(42).spawn(2)
+
+def gerar_matriz_fake(valores_iniciais, volatilidades, n_dias):
+    rng = np.random.default_rng(SEMENTE_MERCADO)
+    retornos = rng.normal(0, volatilidades, size=(n_dias, len(volatilidades)))
+    np.cumsum(retornos, axis=0, out=retornos)
+    return np.asarray(valores_iniciais) + retornos
 
 def gerar_financeiro_fake():
     datas = pd.date_range(end=datetime.now(), periods=365, freq='B')
     n = len(datas)
-    df = pd.DataFrame(index=datas)
-    df['Dolar'] = gerar_serie_fake(5.0, 0.02, n)
-    df['JBS'] = gerar_serie_fake(25.0, 0.3, n)
-    df['Boi_Gordo'] = gerar_serie_fake(230.0, 1.5, n)
-    return df
+    valores = gerar_matriz_fake([5.0, 25.0, 230.0], [0.02, 0.3, 1.5], n)
+    return pd.DataFrame(valores, index=datas, columns=['Dolar', 'JBS', 'Boi_Gordo']).astype('float32')
 
 def gerar_clima_fake():
     datas = pd.date_range(end=datetime.now(), periods=365, freq='D')
     n = len(datas)
-    temp = 32 + 5 * np.sin(np.linspace(0, 3.14, n)) + np.random.normal(0, 2, n)
-    chuva = np.random.choice([0, 0, 0, 10, 30, 60], n, p=[0.7, 0.1, 0.1, 0.05, 0.03, 0.02])
-    return pd.DataFrame({'Temp_Max': temp, 'Chuva_mm': chuva}, index=datas)
+    rng = np.random.default_rng(SEMENTE_CLIMA)
+    temp = 32 + 5 * np.sin(np.linspace(0, 3.14, n)) + rng.normal(0, 2, n)
+    volumes = np.array([0, 10, 30, 60])
+    cdf = np.cumsum([0.9, 0.05, 0.03, 0.02])
+    chuva = volumes[np.searchsorted(cdf, rng.random(n), side='right').clip(max=len(volumes) - 1)]
+    return pd.DataFrame({'Temp_Max': temp, 'Chuva_mm': chuva}, index=datas).astype('float32')
 
 # --- FUNÇÕES DE DADOS REAIS ---
 
-@st.cache_data(ttl=3600)
-def get_finance_data():
-    tickers = ['BRL=X', 'JBSS3.SA', 'LE=F']
+OPEN_METEO_ARCHIVE_URL = "https://archive-api.open-meteo.com/v1/archive"
+
+@st.cache_resource
+def get_http_session():
+    session = requests.Session()
+    retry = Retry(total=2, read=0, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+    session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retry))
+    return session
+
+class DownloadParcial(ValueError):
+    # Carrega o frame incompleto: exceções não entram no cache, mas os dados reais seguem para o fallback
+    def __init__(self, df):
+        super().__init__("Download parcial")
+        self.df = df
+
+@st.cache_data(persist="disk", max_entries=24, show_spinner=False)
+def baixar_cotacoes(tickers, data_ref, hora):
+    # Persistido em disco por (dia, hora)
+    import yfinance as yf
+    # 'end' do yfinance é exclusivo: +1 dia inclui o dia atual
+    df = yf.download(list(tickers), start=data_ref - timedelta(days=365), end=data_ref + timedelta(days=1),
+                     interval="1d", progress=False, threads=True)
+    if isinstance(df.columns, pd.MultiIndex): df = df['Close']
+    if df.empty: raise ValueError("Dados vazios")
+    # Download parcial não é persistido
+    if df.reindex(columns=list(tickers)).isna().all().any(): raise DownloadParcial(df)
+    return df
+
+def get_finance_data(data_ref):
+    # Ticker -> (coluna, valor inicial, volatilidade do fallback)
+    ativos = {
+        'BRL=X': ('Dolar', 5.10, 0.02),
+        'JBSS3.SA': ('JBS', 32.0, 0.4),
+        'LE=F': ('Gado_Futuro_US', 180.0, 1.0),
+    }
     try:
-        df = yf.download(tickers, period="1y", interval="1d", progress=False)
-        if isinstance(df.columns, pd.MultiIndex): df = df['Close']
-        if df.empty: raise Exception("Dados vazios")
+        try:
+            df = baixar_cotacoes(tuple(ativos), data_ref, datetime.now().hour)
+        except DownloadParcial as e:
+            df = e.df
 
         df_clean = pd.DataFrame(index=df.index)
+        colunas_ok = df.notna().any()
         
         # Lógica de Fallback Granular (Coluna por Coluna)
-        # 1. Dólar
-        if 'BRL=X' in df.columns and not df['BRL=X'].isnull().all():
-            df_clean['Dolar'] = df['BRL=X']
-        else:
-            df_clean['Dolar'] = gerar_serie_fake(5.10, 0.02, len(df))
-
-        # 2. Gado Futuro
-        if 'LE=F' in df.columns and not df['LE=F'].isnull().all():
-            df_clean['Gado_Futuro_US'] = df['LE=F']
-        else:
-            df_clean['Gado_Futuro_US'] = gerar_serie_fake(180.0, 1.0, len(df))
-
-        # 3. JBS
-        if 'JBSS3.SA' in df.columns and not df['JBSS3.SA'].isnull().all():
-            df_clean['JBS'] = df['JBSS3.SA']
-        else:
-            df_clean['JBS'] = gerar_serie_fake(32.0, 0.4, len(df))
-
-        df_clean.index = df_clean.index.tz_localize(None)
-        df_clean = df_clean.ffill().bfill()
-        df_clean['Boi_Gordo'] = (df_clean['Gado_Futuro_US'] / 100) * df_clean['Dolar'] * 3.5 * 15 
+        faltantes = [t for t in ativos if not colunas_ok.get(t, False)]
+        for t, (coluna, _, _) in ativos.items():
+            if t not in faltantes: df_clean[coluna] = df[t]
+
+        if faltantes:
+            fake = gerar_matriz_fake([ativos[t][1] for t in faltantes], [ativos[t][2] for t in faltantes], len(df))
+            for i, t in enumerate(faltantes): df_clean[ativos[t][0]] = fake[:, i]
+
+        if df_clean.index.tz is not None: df_clean.index = df_clean.index.tz_localize(None)
+        df_clean = df_clean.sort_index().ffill().bfill()
+        # Gado futuro (EUA) convertido para R$
+        df_clean['Boi_Gordo'] = df_clean['Gado_Futuro_US'].to_numpy() * df_clean['Dolar'].to_numpy() * (3.5 * 15 / 100)
         
-        return df_clean[['Dolar', 'JBS', 'Boi_Gordo']], True
+        return df_clean[['Dolar', 'JBS', 'Boi_Gordo']].astype('float32'), True
 
-    except:
+    except (requests.RequestException, KeyError, TypeError, ValueError) as e:
+        logger.warning("Mercado: usando dados simulados (%s)", e)
         return gerar_financeiro_fake(), False
 
-@st.cache_data(ttl=3600)
-def get_weather_cuiaba():
+@st.cache_data(persist="disk", max_entries=7, show_spinner=False)
+def baixar_payload(url):
+    # Resposta bruta persistida em disco
+    res = get_http_session().get(url, timeout=3)
+    res.raise_for_status()
+    return res.content
+
+def get_weather_cuiaba(data_ref):
     try:
-        lat, lon = -15.6014, -56.0979
-        end_date = datetime.now().strftime('%Y-%m-%d')
-        start_date = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
-        url = f"https://archive-api.open-meteo.com/v1/archive?latitude={lat}&longitude={lon}&start_date={start_date}&end_date={end_date}&daily=temperature_2m_max,precipitation_sum&timezone=America%2FCuiaba"
+        params = {
+            'latitude': -15.6014, 'longitude': -56.0979,
+            'start_date': (data_ref - timedelta(days=365)).isoformat(), 'end_date': data_ref.isoformat(),
+            'daily': 'temperature_2m_max,precipitation_sum', 'timezone': 'America/Cuiaba',
+        }
+        url = f"{OPEN_METEO_ARCHIVE_URL}?{urlencode(params)}"
         
-        res = requests.get(url, timeout=3)
-        data = res.json()
-        if 'daily' not in data: raise Exception("API Vazia")
-
-        df = pd.DataFrame({
-            'Date': data['daily']['time'],
-            'Temp_Max': data['daily']['temperature_2m_max'],
-            'Chuva_mm': data['daily']['precipitation_sum']
-        })
-        df['Date'] = pd.to_datetime(df['Date'])
-        df.set_index('Date', inplace=True)
-        return df, True
-    except:
+        data = orjson.loads(baixar_payload(url))
+        if 'daily' not in data: raise KeyError("API Vazia")
+
+        daily = data['daily']
+        datas = pd.DatetimeIndex(np.asarray(daily['time'], dtype='datetime64[D]'), name='Date')
+        valores = np.column_stack([
+            np.asarray(daily['temperature_2m_max'], dtype='float32'),
+            np.asarray(daily['precipitation_sum'], dtype='float32')
+        ])
+        df = pd.DataFrame(valores, index=datas, columns=['Temp_Max', 'Chuva_mm'])
+        return df.sort_index(), True
+    except (requests.RequestException, KeyError, TypeError, ValueError) as e:
+        logger.warning("Clima: usando dados simulados (%s)", e)
         return gerar_clima_fake(), False
 
+# --- FUNÇÕES DE VISUALIZAÇÃO ---
+
+MAX_PONTOS_GRAFICO = 1000
+
+def reduzir_serie(x, y, n_max=MAX_PONTOS_GRAFICO):
+    # Downsampling Min/Max: mantém o menor e o maior ponto de cada bucket
+    x, y = np.asarray(x), np.asarray(y)
+    n = len(y)
+    if n <= n_max: return x, y
+    bordas = np.linspace(0, n, n_max // 2 + 1).astype(int)
+    bucket = np.repeat(np.arange(len(bordas) - 1), np.diff(bordas))
+    ordem = np.lexsort((y, bucket))
+    idx = np.unique(np.concatenate([ordem[bordas[:-1]], ordem[bordas[1:] - 1]]))
+    return x[idx], y[idx]
+
+MAX_BARRAS_GRAFICO = 180
+
+def agregar_chuva(chuva, n_max=MAX_BARRAS_GRAFICO):
+    # Períodos longos viram totais de 7 dias a partir do início do recorte;
+    # cada barra fica centrada nos dias que soma (a última pode ser parcial)
+    if len(chuva) <= n_max: return chuva.index, chuva, "Chuva (mm)"
+    semanal = chuva.resample('7D').sum()
+    um_dia = pd.Timedelta(days=1)
+    inicio = semanal.index
+    fim = np.minimum(inicio + 7 * um_dia, chuva.index[-1] + um_dia)
+    dias = (chuva.index[-1] - chuva.index[0]) // um_dia + 1
+    nome = "Chuva 7 dias (mm)" if dias % 7 == 0 else "Chuva 7 dias (mm, última barra parcial)"
+    return inicio + (fim - inicio) / 2, semanal, nome
+
+def correlacao(x, y):
+    xm = np.asarray(x, dtype=float); xm = xm - xm.mean()
+    ym = np.asarray(y, dtype=float); ym = ym - ym.mean()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return float(xm @ ym / np.sqrt((xm @ xm) * (ym @ ym)))
+
+# --- FUNÇÕES DE FILTRO ---
+
+def _chave_df(df):
+    # Chave de cache barata: forma, período e checksum
+    return (df.shape, tuple(df.columns), df.index.min(), df.index.max(), float(np.nansum(df.to_numpy())))
+
+@st.cache_data(max_entries=32, hash_funcs={pd.DataFrame: _chave_df})
+def filtrar_periodo(df, inicio, fim):
+    df_f = df.loc[str(inicio):str(fim)]
+    if df_f.empty: return df_f, None, None, np.nan
+    dia_dados = df_f.iloc[-1].to_dict()
+    dia_anterior = df_f.iloc[-2].to_dict() if len(df_f) > 1 else dia_dados
+    return df_f, dia_dados, dia_anterior, correlacao(df_f['Chuva_mm'], df_f['Boi_Gordo'])
+
+# --- GRÁFICOS ---
+
+LAYOUT_MERCADO = dict(height=450, template="plotly_white", yaxis=dict(title="R$"), yaxis2=dict(title="USD", overlaying='y', side='right'))
+LAYOUT_CLIMA = dict(height=400, template="plotly_white")
+
+@st.cache_resource(max_entries=16, hash_funcs={pd.DataFrame: _chave_df})
+def montar_fig_mercado(df_filtered):
+    fig_ind = go.Figure()
+    x_ms = df_filtered.index.to_numpy(dtype='datetime64[ms]')
+    x, y = reduzir_serie(x_ms, df_filtered['Boi_Gordo'].to_numpy())
+    fig_ind.add_trace(go.Scattergl(x=x, y=y, name="Boi Gordo (R$)", line=dict(color='#8e44ad')))
+    x, y = reduzir_serie(x_ms, df_filtered['JBS'].to_numpy())
+    fig_ind.add_trace(go.Scattergl(x=x, y=y, name="Ação JBS (R$)", line=dict(color='#e67e22')))
+    x, y = reduzir_serie(x_ms, df_filtered['Dolar'].to_numpy())
+    fig_ind.add_trace(go.Scattergl(x=x, y=y, name="Dólar", line=dict(color='#2ecc71', dash='dot'), yaxis='y2'))
+    fig_ind.update_layout(**LAYOUT_MERCADO)
+    return fig_ind
+
+@st.cache_resource(max_entries=16, hash_funcs={pd.DataFrame: _chave_df})
+def montar_fig_clima(df_filtered):
+    fig_clima = make_subplots(specs=[[{"secondary_y": True}]])
+    x_chuva, chuva, nome_chuva = agregar_chuva(df_filtered['Chuva_mm'])
+    fig_clima.add_trace(go.Bar(x=x_chuva.to_numpy(dtype='datetime64[ms]'), y=chuva.to_numpy(), name=nome_chuva, marker_color='#3498db', opacity=0.4), secondary_y=False)
+    x, y = reduzir_serie(df_filtered.index.to_numpy(dtype='datetime64[ms]'), df_filtered['Boi_Gordo'].to_numpy())
+    fig_clima.add_trace(go.Scattergl(x=x, y=y, name="Preço Boi (R$)", line=dict(color='#c0392b')), secondary_y=True)
+    fig_clima.update_layout(**LAYOUT_CLIMA)
+    return fig_clima
+
+# --- FUNÇÕES DE EXPORTAÇÃO ---
+
+@st.cache_data(max_entries=32)
+def to_csv_bytes(df):
+    buf = io.BytesIO()
+    df.to_csv(buf, encoding='utf-8')
+    return buf.getvalue()
+
 # --- CARGA E TRATAMENTO ---
-df_fin, is_real_fin = get_finance_data()
-df_clima, is_real_clima = get_weather_cuiaba()
-
-# Merge interno para o Dashboard (O aluno vê o resultado final, mas baixa separado)
-df_full = pd.concat([df_fin, df_clima], axis=1).sort_index()
-df_full['Dolar'] = df_full['Dolar'].ffill().bfill()
-df_full['JBS'] = df_full['JBS'].ffill().bfill()
-df_full['Boi_Gordo'] = df_full['Boi_Gordo'].ffill().bfill()
-df_full['Chuva_mm'] = df_full['Chuva_mm'].fillna(0)
-df_full['Temp_Max'] = df_full['Temp_Max'].ffill().bfill()
-df_full = df_full.fillna(0)
+
+@st.cache_resource(ttl=3600)
+def load_all(data_ref):
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        f_fin = ex.submit(get_finance_data, data_ref)
+        f_clima = ex.submit(get_weather_cuiaba, data_ref)
+        df_fin, is_real_fin = f_fin.result()
+        df_clima, is_real_clima = f_clima.result()
+
+    # Merge interno para o Dashboard (O aluno vê o resultado final, mas baixa separado)
+    idx = df_fin.index.union(df_clima.index)
+    df_full = pd.DataFrame({c: serie.reindex(idx) for df in (df_fin, df_clima) for c, serie in df.items()}, index=idx)
+    # Chuva ausente = 0 mm; demais colunas propagam o último valor
+    df_full = df_full.fillna({'Chuva_mm': 0}).ffill().bfill().fillna(0)
+    return df_full, is_real_fin, is_real_clima
+
+df_full, is_real_fin, is_real_clima = load_all(datetime.now().date())
 
 # --- SIDEBAR ---
 with st.sidebar:
@@ -131,6 +271,13 @@ with st.sidebar:
     if is_real_fin: st.toast("Mercado: Online", icon="🟢")
     else: st.toast("Mercado: Simulado", icon="🟠")
     
+    # Descarta só os dados baixados (sessão HTTP e demais caches ficam): a próxima execução volta às APIs
+    if st.button("🔄 Atualizar dados"):
+        baixar_cotacoes.clear()
+        baixar_payload.clear()
+        load_all.clear()
+        st.rerun()
+    
     st.markdown("---")
     
     if not df_full.empty:
@@ -146,8 +293,7 @@ with st.sidebar:
     start_date_graph = st.date_input("De:", value=default_start, min_value=min_date, max_value=max_date)
     end_date_graph = st.date_input("Até:", value=max_date, min_value=min_date, max_value=max_date)
 
-mask = (df_full.index.date >= start_date_graph) & (df_full.index.date <= end_date_graph)
-df_filtered = df_full.loc[mask]
+df_filtered, dia_dados, dia_anterior, corr = filtrar_periodo(df_full, start_date_graph, end_date_graph)
 
 # --- DASHBOARD ---
 st.title(f"Monitor Agro: {end_date_graph.strftime('%d/%m/%Y')}")
@@ -156,49 +302,43 @@ if df_filtered.empty:
     st.error("Sem dados.")
     st.stop()
 
-dia_dados = df_filtered.iloc[-1]
-dia_anterior = df_filtered.iloc[-2] if len(df_filtered) > 1 else dia_dados
+# KPI: (rótulo, coluna, formato do valor, formato da variação)
+KPIS = [
+    ("💵 Dólar", 'Dolar', "R$ {:.3f}", "{:.3f}"),
+    ("🐂 Boi Gordo", 'Boi_Gordo', "R$ {:.2f}", "{:.2f}"),
+    ("🏭 JBS (JBSS3)", 'JBS', "R$ {:.2f}", "{:.2f}"),
+]
 
 col1, col2, col3, col4 = st.columns(4)
-def kpi(label, val, prev, prefix="R$ ", decim=2):
-    try:
-        val, prev = float(val), float(prev)
+for (label, coluna, fmt_valor, fmt_delta), col in zip(KPIS, (col1, col2, col3)):
+    # 0 indica série sem cotação
+    val, prev = dia_dados[coluna], dia_anterior[coluna]
+    with col:
         if val == 0: st.metric(label, "N/A", "0.00")
-        else: st.metric(label, f"{prefix}{val:.{decim}f}", f"{val-prev:.{decim}f}")
-    except: st.metric(label, "N/A", "0.00")
-
-with col1: kpi("💵 Dólar", dia_dados['Dolar'], dia_anterior['Dolar'], "R$ ", 3)
-with col2: kpi("🐂 Boi Gordo", dia_dados['Boi_Gordo'], dia_anterior['Boi_Gordo'])
-with col3: kpi("🏭 JBS (JBSS3)", dia_dados['JBS'], dia_anterior['JBS'])
+        else: st.metric(label, fmt_valor.format(val), fmt_delta.format(val - prev))
 with col4: st.metric("🌧️ Chuva (Cuiabá)", f"{dia_dados['Chuva_mm']:.1f} mm")
 
 st.markdown("---")
 
-tab1, tab2, tab3 = st.tabs(["📊 Mercado", "🌦️ Clima vs. Preço", "💾 Dados (ETL)"])
+# --- ABAS ---
+# Cada aba é um fragmento: interações nela só reexecutam a própria aba
 
-with tab1:
-    fig_ind = go.Figure()
-    fig_ind.add_trace(go.Scatter(x=df_filtered.index, y=df_filtered['Boi_Gordo'], name="Boi Gordo (R$)", line=dict(color='#8e44ad')))
-    fig_ind.add_trace(go.Scatter(x=df_filtered.index, y=df_filtered['JBS'], name="Ação JBS (R$)", line=dict(color='#e67e22')))
-    fig_ind.add_trace(go.Scatter(x=df_filtered.index, y=df_filtered['Dolar'], name="Dólar", line=dict(color='#2ecc71', dash='dot'), yaxis='y2'))
-    fig_ind.update_layout(height=450, template="plotly_white", yaxis=dict(title="R$"), yaxis2=dict(title="USD", overlaying='y', side='right'))
-    st.plotly_chart(fig_ind, use_container_width=True)
+@st.fragment
+def render_mercado(df_filtered):
+    st.plotly_chart(montar_fig_mercado(df_filtered), use_container_width=True, key="fig_mercado")
 
-with tab2:
+@st.fragment
+def render_clima(df_filtered, corr):
     col_c1, col_c2 = st.columns([3, 1])
     with col_c1:
-        fig_clima = make_subplots(specs=[[{"secondary_y": True}]])
-        fig_clima.add_trace(go.Bar(x=df_filtered.index, y=df_filtered['Chuva_mm'], name="Chuva (mm)", marker_color='#3498db', opacity=0.4), secondary_y=False)
-        fig_clima.add_trace(go.Scatter(x=df_filtered.index, y=df_filtered['Boi_Gordo'], name="Preço Boi (R$)", line=dict(color='#c0392b')), secondary_y=True)
-        fig_clima.update_layout(height=400, template="plotly_white")
-        st.plotly_chart(fig_clima, use_container_width=True)
+        st.plotly_chart(montar_fig_clima(df_filtered), use_container_width=True, key="fig_clima")
     with col_c2:
         st.markdown("**Correlação**")
-        corr = df_filtered[['Chuva_mm', 'Boi_Gordo']].corr().iloc[0,1]
         st.info(f"Índice: {corr:.2f}")
 
 # --- ABA DE DOWNLOADS (SEPARADOS) ---
-with tab3:
+@st.fragment
+def render_dados(df_filtered):
     st.subheader("Central de Extração (Desafio ETL)")
     st.info("💡 As bases de dados estão separadas propositalmente. Você precisará cruzá-las usando a Data como chave.")
 
@@ -213,7 +353,7 @@ with tab3:
         df_fin_export = df_filtered[cols_fin_validas]
         
         st.dataframe(df_fin_export.tail(3), use_container_width=True)
-        csv_fin = df_fin_export.to_csv().encode('utf-8')
+        csv_fin = to_csv_bytes(df_fin_export)
         st.download_button("📥 Baixar Financeiro.csv", csv_fin, "finance_data.csv", "text/csv")
 
     with c2:
@@ -224,9 +364,14 @@ with tab3:
         df_clima_export = df_filtered[cols_clima_validas]
         
         st.dataframe(df_clima_export.tail(3), use_container_width=True)
-        csv_clima = df_clima_export.to_csv().encode('utf-8')
+        csv_clima = to_csv_bytes(df_clima_export)
         st.download_button("📥 Baixar Clima.csv", csv_clima, "weather_data.csv", "text/csv")
 
-        st.dataframe(df_filtered.sort_index(ascending=False), use_container_width=True)
-        csv = df_filtered.to_csv().encode('utf-8')
+        st.dataframe(df_filtered.iloc[::-1], use_container_width=True)
+        csv = to_csv_bytes(df_filtered)
         st.download_button("📥 Baixar CSV", csv, "dados_agro.csv", "text/csv")
+
+tab1, tab2, tab3 = st.tabs(["📊 Mercado", "🌦️ Clima vs. Preço", "💾 Dados (ETL)"])
+with tab1: render_mercado(df_filtered)
+with tab2: render_clima(df_filtered, corr)
+with tab3: render_dados(df_filtered)